@@ -24,11 +24,16 @@ import ast
 import json
 import sys
 import logging
-import argparse
 import asyncio
+import importlib.util
+import multiprocessing
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict, List, Any, Set, Tuple, Optional, Union
 
 try:
@@ -45,10 +50,56 @@ except ImportError:
     PATHSPEC_AVAILABLE = False
     print("🙈 pathspec missing - I'll just ignore your .gitignore... like everyone else!")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # No turbo - the stdlib json will do, just a bit slower
+    ORJSON_AVAILABLE = False
+
+try:
+    import resource
+except ImportError:
+    # Windows doesn't do rlimits - we'll just trust the default budget
+    resource = None
+
+# numba is heavy to import, so only peek for it now and load it when we actually index
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
 # Places we won't peek (I respect privacy!)
 SKIP_DIRS = {'.logs', '.venv', '.git', '__pycache__', 'node_modules', 'build', 'dist'}
 REDIS_URL = os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0")
+ENTITY_TYPES = ("class", "function", "method", "variable")
 VERSION = "1.0.0"
+INDEX_CONCURRENCY = 32  # Files we juggle at once before dropping one
+SCAN_WORKERS = 8  # Search party size for hunting down Python files
+PIPELINE_BATCH_FILES = 200  # Files' worth of memories we carry to Redis per trip
+PARSE_POOL_MIN_FILES = 64  # Below this, hiring extra brains (processes) costs more than it saves
+# Parse workers start fresh instead of forking us - by then our reader threads are running,
+# and forking a threaded process can deadlock. forkserver where it exists, spawn elsewhere
+PARSE_POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+SCAN_COUNT = 1000  # Keys per SCAN nibble - never swallow the whole keyspace with KEYS
+UNLINK_BATCH = 1000  # Keys we toss per flush when forgetting in bulk
+REDIS_MAX_CONNECTIONS = 64  # Phone lines to the memory bank, shared by every command
+MAX_OPEN_FILES = 256  # Files we'll hold open at once, at most
+
+def _open_file_budget() -> int:
+    """How many files we can read at once before the OS starts shouting EMFILE."""
+    if resource is None:
+        return MAX_OPEN_FILES
+    try:
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ValueError, OSError):
+        return MAX_OPEN_FILES
+    if soft_limit == resource.RLIM_INFINITY:
+        return MAX_OPEN_FILES
+    # Leave room for the Redis connections and the usual stdio/log handles
+    return max(1, min(MAX_OPEN_FILES, soft_limit - REDIS_MAX_CONNECTIONS - 16))
+
+OPEN_FILE_BUDGET = _open_file_budget()
+
+# Guards every file read; indexing also never juggles more files than this
+FD_SEM = asyncio.BoundedSemaphore(OPEN_FILE_BUDGET)
 
 ######################
 # Memory Maintenance #
@@ -88,12 +139,14 @@ def load_gitignore_patterns(base_dir: Path) -> Optional[Any]:
         return pathspec.PathSpec.from_lines("gitwildmatch", patterns)
     return None
 
-def is_ignored(path: Path, base_dir: Path, gitignore_spec) -> bool:
-    """Check if a file wants to be left alone. We respect boundaries."""
-    if gitignore_spec is None:
-        return False
-    rel_path = str(path.relative_to(base_dir))
-    return gitignore_spec.match_file(rel_path)
+def _rel_path(file_path: Path, base_dir: Path) -> str:
+    """Where a file lives relative to the project, by string surgery instead of Path.relative_to."""
+    base_prefix = os.path.join(str(base_dir), "")
+    path_str = str(file_path)
+    if path_str.startswith(base_prefix):
+        return path_str[len(base_prefix):].replace(os.sep, "/")
+    # Not one of ours - let Path explain why (it raises ValueError)
+    return file_path.relative_to(base_dir).as_posix()
 
 def collect_python_files(app_dir: Path, gitignore_spec, specific_files: Optional[List[str]] = None) -> List[Path]:
     """Find all Python files like they're Easter eggs."""
@@ -102,220 +155,419 @@ def collect_python_files(app_dir: Path, gitignore_spec, specific_files: Optional
                 for file_path in specific_files 
                 if (app_dir / file_path).exists() and (app_dir / file_path).is_file()]
     
+    # Send a search party into every directory at once
+    base = os.path.join(str(app_dir), "")
     python_files = []
-    for root, dirs, files in os.walk(app_dir, topdown=True):
-        # Skip directories that are basically "nothing to see here"
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        # Respect the "do not disturb" signs
-        if gitignore_spec:
-            dirs[:] = [d for d in dirs if not is_ignored(Path(root) / d, app_dir, gitignore_spec)]
-            
-        root_path = Path(root)
-        for file in files:
-            if file.endswith('.py') and (not gitignore_spec or not is_ignored(root_path / file, app_dir, gitignore_spec)):
-                python_files.append(root_path / file)
-                
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        pending = {executor.submit(_scan_directory, base, base, gitignore_spec)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                python_files.extend(files)
+                pending.update(executor.submit(_scan_directory, d, base, gitignore_spec) for d in subdirs)
+
+    python_files.sort()
     return python_files
 
+def _scan_directory(path: str, base: str, gitignore_spec) -> Tuple[List[Path], List[str]]:
+    """Search one room of the house, noting which doors lead further in."""
+    prefix_len = len(base)
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    # Skip directories that are basically "nothing to see here" (and symlinks, like os.walk)
+                    if entry.name in SKIP_DIRS or entry.is_symlink():
+                        continue
+                    # Respect the "do not disturb" signs
+                    if gitignore_spec and gitignore_spec.match_file(entry.path[prefix_len:]):
+                        continue
+                    subdirs.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    if gitignore_spec and gitignore_spec.match_file(entry.path[prefix_len:]):
+                        continue
+                    files.append(Path(entry.path))
+    except OSError:
+        # Locked room - walk on by, just like os.walk would
+        pass
+    return files, subdirs
+
 ##########################
 # Code Analyzing Wizards #
 ##########################
 
+def _signature_header(segment: str) -> Optional[str]:
+    """Find the colon that ends a def header, tiptoeing around brackets, strings and comments."""
+    depth = 0
+    quote = None
+    pieces = []
+    start = i = 0
+    n = len(segment)
+    
+    while i < n:
+        ch = segment[i]
+        if quote:
+            # Inside a string, nothing counts until the closing quote
+            if ch == '\\':
+                i += 2
+            elif segment.startswith(quote, i):
+                i += len(quote)
+                quote = None
+            else:
+                i += 1
+            continue
+        
+        if ch == '"' or ch == "'":
+            quote = ch * 3 if segment.startswith(ch * 3, i) else ch
+            i += len(quote)
+            continue
+        if ch == '#':
+            # Comments are for humans - snip until the end of the line
+            pieces.append(segment[start:i])
+            newline = segment.find('\n', i)
+            if newline == -1:
+                return None
+            start = i = newline
+            continue
+        
+        if ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+        elif ch == ':' and depth == 0:
+            # Found the treasure!
+            pieces.append(segment[start:i])
+            return "".join(pieces)
+        i += 1
+    
+    return None
+
+def _find_sig_end(buf: bytes, start: int, limit: int) -> int:
+    """Byte-level colon hunt for the JIT: offset of the header colon, -1 if none, -2 if a comment is in the way."""
+    depth = 0
+    quote = 0
+    triple = False
+    i = start
+    
+    while i < limit:
+        c = buf[i]
+        if quote != 0:
+            if c == 92:  # backslash
+                i += 2
+            elif c == quote and not triple:
+                quote = 0
+                i += 1
+            elif c == quote and i + 2 < limit and buf[i + 1] == quote and buf[i + 2] == quote:
+                quote = 0
+                i += 3
+            else:
+                i += 1
+            continue
+        
+        if c == 34 or c == 39:  # " or '
+            triple = i + 2 < limit and buf[i + 1] == c and buf[i + 2] == c
+            quote = c
+            i += 3 if triple else 1
+            continue
+        if c == 35:  # '#' - comments need the careful (Python) treatment
+            return -2
+        
+        if c == 40 or c == 91 or c == 123:  # ( [ {
+            depth += 1
+        elif c == 41 or c == 93 or c == 125:  # ) ] }
+            depth -= 1
+        elif c == 58 and depth == 0:  # :
+            return i
+        i += 1
+    
+    return -1
+
+_compiled_find_sig_end = None
+
+def _sig_scanner() -> Optional[Any]:
+    """Warm up the JIT on first use; None means plain Python it is."""
+    global NUMBA_AVAILABLE, _compiled_find_sig_end
+    if _compiled_find_sig_end is None and NUMBA_AVAILABLE:
+        try:
+            import numba
+            _compiled_find_sig_end = numba.njit(cache=True)(_find_sig_end)
+        except Exception:
+            # No JIT - signatures get scanned by plain old Python
+            NUMBA_AVAILABLE = False
+    return _compiled_find_sig_end
+
 def _get_signature(node: ast.FunctionDef, source_lines: List[str]) -> str:
     """Extract a function's autograph - like I'm a code celebrity stalker."""
     try:
-        if node.body:
-            first_body_line = node.body[0].lineno - 1
-            sig_end_line = node.lineno
-            current_line = first_body_line
-            
-            # Hunt for the colon like it's buried treasure
-            while current_line >= node.lineno - 1:
-                line_content = source_lines[current_line].rstrip()
-                if line_content.endswith(':'):
-                    sig_end_line = current_line + 1
-                    break
-                if current_line > node.lineno-1 and ':' in source_lines[current_line-1]:
-                    sig_end_line = current_line
-                    break
-                current_line -= 1
+        # The AST already knows where the header ends: somewhere before the first body line
+        segment = "\n".join(source_lines[node.lineno-1 : node.body[0].lineno])
+        find_sig_end = _sig_scanner()
+        if find_sig_end is not None:
+            # Let the compiled scanner do the legwork; comments still go the scenic route
+            buf = segment.encode('utf-8')
+            end = find_sig_end(buf, 0, len(buf))
+            if end >= 0:
+                header = buf[:end].decode('utf-8')
+            elif end == -1:
+                header = None
             else:
-                sig_end_line = node.lineno
-            
-            # Extract the signature with surgical precision
-            signature_lines = source_lines[node.lineno-1 : sig_end_line]
-            sig_str = " ".join(line.strip() for line in signature_lines).split('#')[0].strip()
-            
-            if sig_str.endswith(':'):
-                sig_str = sig_str[:-1].strip()  # Off with the colon!
-                
-            sig_str = sig_str.replace('\n', ' ').strip()
-            return sig_str if sig_str else f"def {node.name}(...):"
+                header = _signature_header(segment)
         else:
-            return ast.unparse(node)
+            header = _signature_header(segment)
+        if header is None:
+            return f"def {node.name}(...)"
+        
+        sig_str = " ".join(line for line in (raw.strip() for raw in header.split('\n')) if line)
+        return sig_str if sig_str else f"def {node.name}(...):"
     except Exception:
         # When all else fails, just guess
         return f"def {node.name}(...)"
 
-def extract_code_info(file_path: Path, source_lines: List[str], base_dir: Path) -> List[Dict]:
-    """Perform a deep code investigation, CSI-style."""
-    entities = []
-    rel_path = file_path.relative_to(base_dir).as_posix()
+# Statement lists a node can hold, in the order ast.walk would reach them
+_BODY_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+class _Extractor:
+    """A tour guide that walks every statement but only talks about module and class residents."""
+    
+    def __init__(self, rel_path: str, source_lines: List[str]):
+        self.rel_path = rel_path
+        self.source_lines = source_lines
+        self.entities: List[Dict] = []
+    
+    def remember(self, entity_type: str, entity_name: str, entity_data: Dict) -> None:
+        # If we found something interesting, add it to our collection
+        self.entities.append({
+            "entity_type": entity_type,
+            "file_path": self.rel_path,
+            "name": entity_name,
+            **entity_data
+        })
     
+    def visit_body(self, tree: ast.Module) -> None:
+        # Statements only - expressions never hide classes. Breadth-first like ast.walk,
+        # so when two entities share an id the same one wins as always
+        handlers = _ENTITY_HANDLERS
+        queue = deque([tree])
+        while queue:
+            node = queue.popleft()
+            for field in _BODY_FIELDS:
+                for child in getattr(node, field, ()):
+                    handler = handlers.get(type(child))
+                    if handler is not None:
+                        handler(child, node, self)
+                    # try/if/with/def bodies have no entities of their own, but may hide classes
+                    queue.append(child)
+
+def _h_function(node: ast.FunctionDef, parent: ast.AST, ctx: _Extractor) -> None:
+    # Functions inside functions (or ifs, or loops) are just implementation details
+    if type(parent) is not ast.ClassDef and type(parent) is not ast.Module:
+        return
     try:
-        # Turn code into a tree - time for the AST-rological reading
-        tree = ast.parse("\n".join(source_lines))
+        entity_data = {
+            "signature": _get_signature(node, ctx.source_lines),
+            "docstring": ast.get_docstring(node) or "",
+            "line_start": node.lineno,
+            "line_end": getattr(node, 'end_lineno', node.lineno)
+        }
         
-        # Add parent references - because everyone needs to know their daddy
-        for node in ast.walk(tree):
-            for child in ast.iter_child_nodes(node):
-                child.parent = node  # type: ignore
-    except SyntaxError:
-        # Bad syntax? Not my problem!
-        return []
+        # Is it a method or a lone wolf function?
+        if type(parent) is ast.ClassDef:
+            entity_data["parent_class"] = parent.name
+            ctx.remember("method", node.name, entity_data)
+        elif type(parent) is ast.Module:
+            ctx.remember("function", node.name, entity_data)
     except Exception:
-        # Mystery error? Also not my problem!
-        return []
-    
-    # Walk the tree like we're on a code safari
-    for node in ast.walk(tree):
-        entity_data = None
-        entity_type = None
-        entity_name = None
-        parent_name = None
-        
+        # When the going gets tough, the tough skip and move on
+        pass
+
+def _h_class(node: ast.ClassDef, parent: ast.AST, ctx: _Extractor) -> None:
+    # Only care about module-level classes, not weird nested ones (the walk still finds their methods)
+    if type(parent) is ast.Module:
         try:
-            if isinstance(node, ast.FunctionDef):
-                parent = getattr(node, 'parent', None)
-                
-                # Is it a method or a lone wolf function?
-                if isinstance(parent, ast.ClassDef):
-                    entity_type = "method"
-                    parent_name = parent.name
-                elif isinstance(parent, ast.Module):
-                    entity_type = "function"
-                else:
-                    continue
+            # Who's your daddy? (class inheritance)
+            bases = [ast.unparse(base) for base in node.bases]
+            ctx.remember("class", node.name, {
+                "bases": bases,
+                "docstring": ast.get_docstring(node) or "",
+                "line_start": node.lineno,
+                "line_end": getattr(node, 'end_lineno', node.lineno)
+            })
+        except Exception:
+            pass
+
+def _h_assign(node: ast.Assign, parent: ast.AST, ctx: _Extractor) -> None:
+    # Module and class variables only - locals come and go
+    if type(parent) is not ast.ClassDef and type(parent) is not ast.Module:
+        return
+    try:
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                # What's inside the box?
+                match node.value:
+                    case ast.Constant(value=value):
+                        value_repr = repr(value)
+                    case ast.List():
+                        value_repr = "[lots_of_stuff]"
+                    case ast.Dict():
+                        value_repr = "{key: value, ...}"
+                    case _:
+                        value_repr = "<something_complicated>"
                     
-                entity_name = node.name
                 entity_data = {
-                    "signature": _get_signature(node, source_lines),
-                    "docstring": ast.get_docstring(node) or "",
+                    "value_repr": value_repr,
                     "line_start": node.lineno,
                     "line_end": getattr(node, 'end_lineno', node.lineno)
                 }
                 
-                if parent_name:
-                    entity_data["parent_class"] = parent_name
+                if type(parent) is ast.ClassDef:
+                    entity_data["parent_class"] = parent.name
                     
-            elif isinstance(node, ast.ClassDef):
-                parent = getattr(node, 'parent', None)
-                
-                # Only care about module-level classes, not weird nested ones
-                if not isinstance(parent, ast.Module):
-                    continue
-                    
-                entity_type = "class"
-                entity_name = node.name
-                
-                # Who's your daddy? (class inheritance)
-                bases = []
-                for base in node.bases:
-                    try:
-                        base_repr = ast.unparse(base)
-                    except AttributeError:
-                        base_repr = getattr(base, 'id', '<fancy_parent_i_cant_understand>')
-                    except Exception:
-                        base_repr = '<parent_issues>'
-                    bases.append(base_repr)
-                    
-                entity_data = {
-                    "bases": bases,
-                    "docstring": ast.get_docstring(node) or "",
-                    "line_start": node.lineno,
-                    "line_end": getattr(node, 'end_lineno', node.lineno)
-                }
-                
-            elif isinstance(node, ast.Assign):
-                parent = getattr(node, 'parent', None)
-                is_module_level = isinstance(parent, ast.Module)
-                is_class_level = isinstance(parent, ast.ClassDef)
-                
-                # We only care about class or module variables
-                if is_module_level or is_class_level:
-                    for target in node.targets:
-                        if isinstance(target, ast.Name):
-                            entity_type = "variable"
-                            entity_name = target.id
-                            
-                            # What's inside the box?
-                            value_repr = "<something_complicated>"
-                            try:
-                                if isinstance(node.value, ast.Constant):
-                                    value_repr = repr(node.value.value)
-                                elif isinstance(node.value, ast.List):
-                                    value_repr = "[lots_of_stuff]"
-                                elif isinstance(node.value, ast.Dict):
-                                    value_repr = "{key: value, ...}"
-                            except Exception:
-                                pass
-                                
-                            entity_data = {
-                                "value_repr": value_repr,
-                                "line_start": node.lineno,
-                                "line_end": getattr(node, 'end_lineno', node.lineno)
-                            }
-                            
-                            if is_class_level:
-                                entity_data["parent_class"] = parent.name  # type: ignore
-                                
-                            break
-                            
-        except Exception:
-            # When the going gets tough, the tough skip and move on
-            continue
-            
-        # If we found something interesting, add it to our collection
-        if entity_type and entity_name and entity_data:
-            base_entity = {
-                "entity_type": entity_type,
-                "file_path": rel_path,
-                "name": entity_name,
-                **entity_data
-            }
-            entities.append(base_entity)
-            
-    return entities
+                ctx.remember("variable", target.id, entity_data)
+                break
+    except Exception:
+        pass
+
+# Who handles what - an exact-type lookup instead of a ladder of isinstance checks
+_ENTITY_HANDLERS = {
+    ast.FunctionDef: _h_function,
+    ast.ClassDef: _h_class,
+    ast.Assign: _h_assign,
+}
+
+def extract_code_info(file_path: Path, source: str, base_dir: Path) -> List[Dict]:
+    """Perform a deep code investigation, CSI-style."""
+    rel_path = _rel_path(file_path, base_dir)
+    
+    try:
+        # Turn code into a tree - time for the AST-rological reading
+        tree = ast.parse(source, filename=str(file_path))
+    except SyntaxError:
+        # Bad syntax? Not my problem!
+        return []
+    except Exception:
+        # Mystery error? Also not my problem!
+        return []
+    
+    # One walk through the tree, only visiting the rooms we care about
+    # (lines split on '\n' only, so they stay in step with the parser's line numbers)
+    extractor = _Extractor(rel_path, source.split('\n'))
+    extractor.visit_body(tree)
+    return extractor.entities
 
 #######################
 # Redis Memory Palace #
 #######################
 
+# One pool of connections for the whole process - no fresh handshake per command
+_redis_pool: Optional[Any] = None
+_redis_pinged = False
+
+async def _client() -> redis.Redis:
+    """Borrow a line to the memory bank, checking it's awake the first time we call."""
+    global _redis_pool, _redis_pinged
+    if _redis_pool is None:
+        _redis_pool = redis.ConnectionPool.from_url(REDIS_URL, max_connections=REDIS_MAX_CONNECTIONS)
+    redis_client = redis.Redis(connection_pool=_redis_pool)
+    if not _redis_pinged:
+        await redis_client.ping()
+        _redis_pinged = True
+    return redis_client
+
+async def close_redis_pool() -> None:
+    """Hang up every line to the memory bank - once, when the process is done."""
+    global _redis_pool, _redis_pinged
+    if _redis_pool is not None:
+        pool, _redis_pool, _redis_pinged = _redis_pool, None, False
+        await pool.disconnect()
+
+def _dumps(obj: Any) -> Union[bytes, str]:
+    """Squash a memory into wire format - orjson if we have it, json if we don't."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False)
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Unsquash a memory, whichever way it was squashed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def file_fingerprint(stat: os.stat_result) -> str:
+    """Same mtime, same size? Then it's the same old file we already know."""
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+async def needs_reindex(file_paths: List[Path], base_dir: Path, key_prefix: str,
+                        redis_client: Optional[redis.Redis] = None) -> List[Path]:
+    """Pick out the files that changed since we last memorized them (one trip to Redis)."""
+    if not redis_client or not file_paths:
+        return list(file_paths)
+    
+    rel_paths = [_rel_path(file_path, base_dir) for file_path in file_paths]
+    remembered = await redis_client.hmget(f"{key_prefix}:mtimes", rel_paths)
+    
+    def changed_files() -> List[Path]:
+        changed = []
+        for file_path, fingerprint in zip(file_paths, remembered):
+            try:
+                if file_fingerprint(os.stat(file_path)).encode() == fingerprint:
+                    continue
+            except OSError:
+                pass  # Let the indexer trip over it and complain properly
+            changed.append(file_path)
+        return changed
+    
+    return await asyncio.to_thread(changed_files)
+
 async def index_file_contents(file_path: Path, base_dir: Path, key_prefix: str, 
                              redis_client: Optional[redis.Redis] = None, 
-                             logger: Optional[logging.Logger] = None) -> bool:
-    """Store file content in our memory palace (aka Redis)."""
-    rel_path = file_path.relative_to(base_dir).as_posix()
+                             logger: Optional[logging.Logger] = None,
+                             content: Optional[str] = None,
+                             pipeline: Optional[Any] = None,
+                             stat: Optional[os.stat_result] = None) -> bool:
+    """Store file content in our memory palace (aka Redis).
+
+    If a pipeline is handed in, the writes are only queued on it and the
+    caller decides when to flush; otherwise we flush our own pipeline.
+    Whoever hands in content should hand in the stat taken *before* reading it.
+    """
+    rel_path = _rel_path(file_path, base_dir)
     
     try:
-        # Read the file like it's a gripping novel
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        # Stat before reading: if the file changes underneath us, the fingerprint
+        # is the stale one and the next run picks the new version up
+        if stat is None:
+            stat = os.stat(file_path)
+        
+        # Read the file like it's a gripping novel (unless someone already read it to us)
+        if content is None:
+            async with FD_SEM:
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
             
         file_data = {
             "path": rel_path,
             "content": content,
             "size": len(content),  # Size matters, apparently
-            "last_modified": os.path.getmtime(file_path)
+            "last_modified": stat.st_mtime
         }
         
         file_key = f"{key_prefix}:files:{rel_path}"
         
         if redis_client:
-            # Store in Redis - your memories are safe with us
-            await redis_client.set(file_key, json.dumps(file_data, ensure_ascii=False))
-            await redis_client.sadd(f"{key_prefix}:file_index", rel_path)
+            # Store in Redis - your memories are safe with us (and travel together)
+            pipe = pipeline if pipeline is not None else redis_client.pipeline(transaction=False)
+            pipe.set(file_key, _dumps(file_data))
+            pipe.sadd(f"{key_prefix}:file_index", rel_path)
+            pipe.hset(f"{key_prefix}:mtimes", rel_path, file_fingerprint(stat))
+            if pipeline is None:
+                await pipe.execute()
             return True
         else:
             if logger:
@@ -327,55 +579,85 @@ async def index_file_contents(file_path: Path, base_dir: Path, key_prefix: str,
             logger.error(f"Failed to memorize {rel_path}: {str(e)}")
         return False
 
-async def store_code_entity_by_type(entities: List[Dict], key_prefix: str, 
+def pack_entities(entities: List[Dict]) -> Dict[str, List]:
+    """Flip a pile of entity cards into neat columns, each card already squashed for Redis."""
+    entity_types, names, file_paths, entity_ids, payloads = [], [], [], [], []
+    
+    for entity in entities:
+        entity_type = entity["entity_type"]
+        file_path = entity["file_path"]
+        name = entity["name"]
+        
+        # Create a fancy ID card for this entity
+        if entity_type == "method":
+            parent_class = entity.get("parent_class", "unknown")
+            entity_id = f"{file_path}:{parent_class}.{name}"
+        else:
+            entity_id = f"{file_path}:{name}"
+        
+        entity_types.append(entity_type)
+        names.append(name)
+        file_paths.append(file_path)
+        entity_ids.append(entity_id)
+        payloads.append(_dumps(entity))
+    
+    return {
+        "entity_type": entity_types,
+        "name": names,
+        "file_path": file_paths,
+        "entity_id": entity_ids,
+        "payload": payloads
+    }
+
+def extract_packed_entities(file_path: Path, source: str, base_dir: Path) -> Dict[str, List]:
+    """Investigate and pack in one go - what worker processes send back (flat lists pickle fast)."""
+    return pack_entities(extract_code_info(file_path, source, base_dir))
+
+async def store_code_entity_by_type(entities: Union[List[Dict], Dict[str, List]], key_prefix: str, 
                                   redis_client: Optional[redis.Redis] = None, 
-                                  logger: Optional[logging.Logger] = None) -> int:
-    """File code facts in our organized brain drawer system."""
+                                  logger: Optional[logging.Logger] = None,
+                                  pipeline: Optional[Any] = None) -> int:
+    """File code facts in our organized brain drawer system.
+
+    Takes either a list of entities or the columns from pack_entities. If a
+    pipeline is handed in, the commands are only queued on it and the caller
+    decides when to flush; otherwise we flush our own pipeline.
+    """
     if not redis_client:
         if logger:
             logger.error("Redis client missing - brain drawers unavailable!")
         return 0
         
-    # Sort entities by type like an obsessive organizer
-    entities_by_type = {}
-    for entity in entities:
-        entity_type = entity["entity_type"]
-        if entity_type not in entities_by_type:
-            entities_by_type[entity_type] = []
-        entities_by_type[entity_type].append(entity)
+    columns = entities if isinstance(entities, dict) else pack_entities(entities)
     
-    total_stored = 0
+    # Sort entities into drawers like an obsessive organizer
+    drawers: Dict[str, Dict[str, Any]] = {}
+    catalog: Dict[str, List[str]] = {}
     
-    # Store each type in its own drawer
-    for entity_type, type_entities in entities_by_type.items():
+    for entity_type, name, file_path, entity_id, payload in zip(
+            columns["entity_type"], columns["name"], columns["file_path"],
+            columns["entity_id"], columns["payload"]):
+        # Store in the filing cabinet
         type_key = f"{key_prefix}:{entity_type}s"  # Classes → Glasses (just kidding)
+        drawers.setdefault(type_key, {})[entity_id] = payload
         
-        pipeline = redis_client.pipeline()
-        for entity in type_entities:
-            file_path = entity["file_path"]
-            name = entity["name"]
-            
-            # Create a fancy ID card for this entity
-            if entity_type == "method":
-                parent_class = entity.get("parent_class", "unknown")
-                entity_id = f"{file_path}:{parent_class}.{name}"
-            else:
-                entity_id = f"{file_path}:{name}"
-            
-            # Store in the filing cabinet
-            pipeline.hset(type_key, entity_id, json.dumps(entity, ensure_ascii=False))
-            
-            # Add to the card catalog for easy searching
-            pipeline.sadd(f"{key_prefix}:search_index:{entity_type}:{name}", entity_id)
-            
-            # Cross-reference with the file it came from
-            pipeline.sadd(f"{key_prefix}:file_entities:{file_path}", f"{entity_type}:{entity_id}")
-            
-            total_stored += 1
-            
-        await pipeline.execute()
+        # Add to the card catalog for easy searching
+        catalog.setdefault(f"{key_prefix}:search_index:{entity_type}:{name}", []).append(entity_id)
+        
+        # Cross-reference with the file it came from
+        catalog.setdefault(f"{key_prefix}:file_entities:{file_path}", []).append(f"{entity_type}:{entity_id}")
+    
+    # One variadic command per drawer instead of one per entity
+    pipe = pipeline if pipeline is not None else redis_client.pipeline(transaction=False)
+    for type_key, fields in drawers.items():
+        pipe.hset(type_key, mapping=fields)
+    for set_key, members in catalog.items():
+        pipe.sadd(set_key, *members)
+        
+    if pipeline is None:
+        await pipe.execute()
     
-    return total_stored
+    return len(columns["entity_id"])
 
 async def store_project_metadata(app_dir: Path, key_prefix: str, 
                                redis_client: Optional[redis.Redis] = None,
@@ -391,7 +673,7 @@ async def store_project_metadata(app_dir: Path, key_prefix: str,
     try:
         existing_json = await redis_client.get(f"{key_prefix}:metadata")
         if existing_json:
-            existing_metadata = json.loads(existing_json)
+            existing_metadata = _loads(existing_json)
     except:
         pass
     
@@ -423,9 +705,54 @@ async def store_project_metadata(app_dir: Path, key_prefix: str,
     metadata["updated_files"] = [f.as_posix() if isinstance(f, Path) else f 
                               for f in metadata.get("updated_files", [])][:20]  # Last 20 for goldfish memory
     
-    await redis_client.set(f"{key_prefix}:metadata", json.dumps(metadata, ensure_ascii=False))
+    await redis_client.set(f"{key_prefix}:metadata", _dumps(metadata))
     return True
 
+async def unlink_keys_matching(redis_client: redis.Redis, pattern: str) -> int:
+    """Forget every key matching a pattern, nibbling with SCAN instead of gulping with KEYS."""
+    count = 0
+    batch = []
+    async for key in redis_client.scan_iter(match=pattern, count=SCAN_COUNT):
+        batch.append(key)
+        if len(batch) >= UNLINK_BATCH:
+            # One UNLINK per chunk: Redis takes out the trash in the background
+            # and never chews on a giant argument list
+            count += await redis_client.unlink(*batch)
+            batch.clear()
+    if batch:
+        count += await redis_client.unlink(*batch)
+    return count
+
+# Targeted amnesia for one file, performed inside Redis so it costs no extra round trips.
+# KEYS: file_entities set, file content key, file_index set, mtimes hash
+# ARGV: key_prefix, rel_path
+_CLEAR_FILE_LUA = """
+local ids = redis.call('SMEMBERS', KEYS[1])
+for _, entity_id in ipairs(ids) do
+    -- entity_id format: "{entity_type}:{file_path}:{name}"
+    local sep = string.find(entity_id, ':', 1, true)
+    if sep then
+        local entity_type = string.sub(entity_id, 1, sep - 1)
+        local id_part = string.sub(entity_id, sep + 1)
+        redis.call('HDEL', ARGV[1] .. ':' .. entity_type .. 's', id_part)
+        if string.find(id_part, ':', 1, true) then
+            -- Methods are filed under their own name, not Class.name
+            local name = string.match(string.match(id_part, '[^:]*$'), '[^.]*$')
+            redis.call('SREM', ARGV[1] .. ':search_index:' .. entity_type .. ':' .. name, id_part)
+        end
+    end
+end
+-- UNLINK frees the (possibly huge) file content off the main thread; an empty
+-- entity set doesn't exist, so unlinking it too is a no-op
+redis.call('UNLINK', KEYS[1], KEYS[2])
+redis.call('SREM', KEYS[3], ARGV[2])
+redis.call('HDEL', KEYS[4], ARGV[2])
+if #ids > 0 then
+    return 1
+end
+return 0
+"""
+
 async def clear_file_data(file_paths: List[Path], base_dir: Path, key_prefix: str, 
                         redis_client: Optional[redis.Redis] = None, 
                         logger: Optional[logging.Logger] = None) -> int:
@@ -433,63 +760,39 @@ async def clear_file_data(file_paths: List[Path], base_dir: Path, key_prefix: st
     if not redis_client:
         return 0
         
-    count = 0
-    pipeline = redis_client.pipeline()
+    forget_file = redis_client.register_script(_CLEAR_FILE_LUA)
+    pipeline = redis_client.pipeline(transaction=False)
     
     for file_path in file_paths:
         try:
-            rel_path = file_path.relative_to(base_dir).as_posix()
-            
-            # Get the list of things to forget
-            entities_key = f"{key_prefix}:file_entities:{rel_path}"
-            entity_ids = await redis_client.smembers(entities_key)
-            
-            if entity_ids:
-                for entity_id in entity_ids:
-                    # entity_id format: "{entity_type}:{file_path}:{name}"
-                    try:
-                        entity_parts = entity_id.split(":", 1)
-                        entity_type = entity_parts[0]
-                        
-                        # Delete from its primary home
-                        type_key = f"{key_prefix}:{entity_type}s"
-                        id_part = entity_parts[1]
-                        pipeline.hdel(type_key, id_part)
-                        
-                        # Remove from the search index too
-                        name_parts = id_part.split(":")
-                        if len(name_parts) > 1:
-                            name = name_parts[-1]
-                            if "." in name:  # Handle methods like they're special
-                                name = name.split(".")[-1]
-                            pipeline.srem(f"{key_prefix}:search_index:{entity_type}:{name}", id_part)
-                    except:
-                        pass
-                        
-                # Clear out the whole filing cabinet
-                pipeline.delete(entities_key)
-                count += 1
-                
-            # Delete the original file content
-            pipeline.delete(f"{key_prefix}:files:{rel_path}")
-            
-            # Remove from the master index
-            pipeline.srem(f"{key_prefix}:file_index", rel_path)
+            rel_path = _rel_path(file_path, base_dir)
             
+            # Queue the amnesia - everything happens server-side in one go
+            await forget_file(
+                keys=[
+                    f"{key_prefix}:file_entities:{rel_path}",
+                    f"{key_prefix}:files:{rel_path}",
+                    f"{key_prefix}:file_index",
+                    f"{key_prefix}:mtimes",
+                ],
+                args=[key_prefix, rel_path],
+                client=pipeline
+            )
         except Exception as e:
             if logger:
                 logger.error(f"Failed to clear memory of {file_path}: {e}")
     
-    await pipeline.execute()
-    return count
+    results = await pipeline.execute()
+    return sum(results)
 
 ####################
 # Memory Retrieval #
 ####################
 
 async def query_code_entity(key_prefix: str, entity_type: str, name: Optional[str] = None, 
-                          redis_client: Optional[redis.Redis] = None) -> List[Dict]:
-    """Search the brain cells for specific memories."""
+                          redis_client: Optional[redis.Redis] = None,
+                          limit: Optional[int] = None) -> List[Dict]:
+    """Search the brain cells for specific memories (at most `limit` of them, if given)."""
     if not redis_client:
         return []
         
@@ -509,70 +812,96 @@ async def query_code_entity(key_prefix: str, entity_type: str, name: Optional[st
                 
             entity_jsons = await pipeline.execute()
             
-            for json_str in entity_jsons:
-                if json_str:
+            # Raw bytes straight into the decoder - no detour through str
+            for entity_json in entity_jsons:
+                if entity_json:
                     try:
-                        entity = json.loads(json_str)
+                        entity = _loads(entity_json)
                         results.append(entity)
                     except:
                         pass
+                    if limit and len(results) >= limit:
+                        break
     elif entity_type:
-        # Get all entities of a type - "show me all the functions!" 
+        # Get all entities of a type - "show me all the functions!" - a scoop at a time
         type_key = f"{key_prefix}:{entity_type}s"
-        all_entities = await redis_client.hgetall(type_key)
+        seen = set()
         
-        for entity_json in all_entities.values():
+        async for entity_id, entity_json in redis_client.hscan_iter(type_key, count=SCAN_COUNT):
+            # HSCAN may hand us the same field twice while Redis rehashes
+            if entity_id in seen:
+                continue
+            seen.add(entity_id)
             try:
-                entity = json.loads(entity_json)
+                entity = _loads(entity_json)
                 results.append(entity)
             except:
                 pass
+            if limit and len(results) >= limit:
+                break
     
     return results
 
-async def get_project_info(key_prefix: str, redis_client: Optional[redis.Redis] = None) -> Dict:
-    """Check the brain status - like getting an MRI."""
+def queue_project_info(pipeline: Any, key_prefix: str) -> None:
+    """Line up the brain-scan questions for one project; parse_project_info reads the answers."""
+    # Get the brain metadata
+    pipeline.get(f"{key_prefix}:metadata")
+    
+    # Count all the things we remember
+    for entity_type in ENTITY_TYPES:
+        pipeline.hlen(f"{key_prefix}:{entity_type}s")
+    
+    # Don't forget to count all the files
+    pipeline.scard(f"{key_prefix}:file_index")
+
+# How many answers queue_project_info asks for, per project
+PROJECT_INFO_REPLIES = len(ENTITY_TYPES) + 2
+
+def parse_project_info(replies: List[Any]) -> Dict:
+    """Turn one project's brain-scan answers into a report."""
     info = {
         "indexed": False,
         "metadata": {},
         "counts": {}
     }
     
-    if not redis_client:
-        return info
-    
-    # Get the brain metadata
-    metadata_json = await redis_client.get(f"{key_prefix}:metadata")
+    metadata_json = replies[0]
     if metadata_json:
         try:
-            info["metadata"] = json.loads(metadata_json)
+            info["metadata"] = _loads(metadata_json)
             info["indexed"] = True
         except:
             pass
     
-    # Count all the things we remember
-    pipeline = redis_client.pipeline()
-    entity_types = ["class", "function", "method", "variable"]
-    
-    for entity_type in entity_types:
-        pipeline.hlen(f"{key_prefix}:{entity_type}s")
-    
-    # Don't forget to count all the files
-    pipeline.scard(f"{key_prefix}:file_index")
-    
-    counts = await pipeline.execute()
-    
-    for i, entity_type in enumerate(entity_types):
-        info["counts"][entity_type] = counts[i]
+    for entity_type, count in zip(ENTITY_TYPES, replies[1:]):
+        info["counts"][entity_type] = count
     
-    info["counts"]["files"] = counts[-1]
+    info["counts"]["files"] = replies[-1]
     
     return info
 
+async def get_project_info(key_prefix: str, redis_client: Optional[redis.Redis] = None) -> Dict:
+    """Check the brain status - like getting an MRI."""
+    if not redis_client:
+        return {
+            "indexed": False,
+            "metadata": {},
+            "counts": {}
+        }
+    
+    pipeline = redis_client.pipeline(transaction=False)
+    queue_project_info(pipeline, key_prefix)
+    return parse_project_info(await pipeline.execute())
+
 #######################
 # High-Level Commands #
 #######################
 
+def _project_name(app_dir: Path) -> str:
+    """Name a project for its key prefix - by its real path, so symlinks and dots find the same memories."""
+    # Must agree with async_index_project, which files everything under the resolved name
+    return app_dir.resolve().name
+
 async def async_index_project(app_dir: Path, specific_files: Optional[List[str]] = None, 
                             logger: Optional[logging.Logger] = None) -> bool:
     """Create a brain backup of your project."""
@@ -601,25 +930,43 @@ async def async_index_project(app_dir: Path, specific_files: Optional[List[str]]
     
     try:
         # Connect to Redis - our external brain storage
-        redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-        await redis_client.ping()
+        redis_client = await _client()
     except Exception as e:
         if logger:
             logger.critical(f"Error connecting to Redis: {e} - Is your memory bank online?")
         return False
     
     try:
-        # For full brain transplants, clear out the old memories
+        # For full brain transplants, keep the old memories only if they speak our version
+        incremental = False
         if not is_partial:
-            existing_keys = await redis_client.keys(f"{key_prefix}:*")
-            if existing_keys:
-                if logger:
-                    logger.info(f"Clearing {len(existing_keys)} existing memories - out with the old!")
-                await redis_client.delete(*existing_keys)
+            existing_json = await redis_client.get(f"{key_prefix}:metadata")
+            if existing_json:
+                try:
+                    incremental = _loads(existing_json).get("version") == VERSION
+                except Exception:
+                    incremental = False
+        
+        # Otherwise clear out the old memories
+        if not is_partial and not incremental:
+            cleared = await unlink_keys_matching(redis_client, f"{key_prefix}:*")
+            if cleared and logger:
+                logger.info(f"Cleared {cleared} existing memories - out with the old!")
         
         # Find all the Python files - our precious memories
         python_files = collect_python_files(app_dir, gitignore_spec, specific_files)
         
+        # Forget files that have left the building since last time
+        if incremental:
+            current_paths = {_rel_path(file_path, app_dir) for file_path in python_files}
+            indexed_paths = await redis_client.smembers(f"{key_prefix}:file_index")
+            vanished = [app_dir / rel_path for rel_path in (raw.decode() for raw in indexed_paths)
+                        if rel_path not in current_paths]
+            if vanished:
+                if logger:
+                    logger.info(f"Forgetting {len(vanished)} files that no longer exist")
+                await clear_file_data(vanished, app_dir, key_prefix, redis_client, logger)
+        
         if not python_files:
             if logger:
                 logger.warning(f"No Python files found in {app_dir} - is this really a Python project?")
@@ -632,26 +979,104 @@ async def async_index_project(app_dir: Path, specific_files: Optional[List[str]]
         if is_partial:
             await clear_file_data(python_files, app_dir, key_prefix, redis_client, logger)
         
-        # Process each file like it's a precious memory
-        total_entities_processed = 0
-        for file_path in python_files:
+        # Skip whatever hasn't changed since the last snapshot
+        files_to_index = python_files
+        if incremental:
+            files_to_index = await needs_reindex(python_files, app_dir, key_prefix, redis_client)
+            if logger:
+                logger.info(f"{len(files_to_index)} of {len(python_files)} files changed - "
+                            f"I still remember the rest!")
+            if files_to_index:
+                await clear_file_data(files_to_index, app_dir, key_prefix, redis_client, logger)
+        
+        # Process the files side by side - many memories at once, but not too many
+        # A tight descriptor limit trumps our juggling ambitions
+        sem = asyncio.BoundedSemaphore(min(INDEX_CONCURRENCY, OPEN_FILE_BUDGET))
+        pipe = redis_client.pipeline(transaction=False)
+        pipe_paths: List[str] = []  # Files whose fingerprints ride in the current batch
+        batched_files = 0
+
+        async def flush() -> None:
+            # Ship the whole batch of memories to Redis in one trip
+            nonlocal pipe, pipe_paths, batched_files
+            batch, batch_paths = pipe, pipe_paths
+            pipe, pipe_paths, batched_files = redis_client.pipeline(transaction=False), [], 0
             try:
-                # Store the complete file
-                await index_file_contents(file_path, app_dir, key_prefix, redis_client, logger)
-                
-                # Extract and store the important parts
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    source_lines = f.read().splitlines()
-                
-                entities = extract_code_info(file_path, source_lines, app_dir)
-                if entities:
-                    stored = await store_code_entity_by_type(entities, key_prefix, redis_client, logger)
-                    total_entities_processed += stored
+                await batch.execute()
             except Exception as e:
-                rel_path_str = file_path.relative_to(app_dir).as_posix()
                 if logger:
-                    logger.error(f"Failed to process {rel_path_str}: {e} - this memory is corrupted!")
+                    logger.error(f"Failed to store a batch of memories: {e}")
+                # Half-remembered files must not look up to date next time
+                if batch_paths:
+                    try:
+                        await redis_client.hdel(f"{key_prefix}:mtimes", *batch_paths)
+                    except Exception:
+                        pass
+
+        # Parsing is pure CPU - farm it out to other processes so the GIL can't hold us back
+        loop = asyncio.get_running_loop()
+        parse_pool = (ProcessPoolExecutor(mp_context=multiprocessing.get_context(PARSE_POOL_START_METHOD))
+                      if len(files_to_index) >= PARSE_POOL_MIN_FILES else None)
+
+        async def process(file_path: Path) -> int:
+            nonlocal batched_files
+            async with sem:
+                stored = 0
+                try:
+                    # Read once, remember twice
+                    # Fingerprint first - a save during the read or parse must not look up to date
+                    stat = os.stat(file_path)
+                    async with FD_SEM:
+                        content = await asyncio.to_thread(file_path.read_text, encoding='utf-8', errors='ignore')
+
+                    # Extract the important parts first - a file that can't be parsed
+                    # must not get a fingerprint saying it's already remembered
+                    if parse_pool:
+                        entities = await loop.run_in_executor(parse_pool, extract_packed_entities,
+                                                              file_path, content, app_dir)
+                    else:
+                        entities = extract_packed_entities(file_path, content, app_dir)
+
+                    # Entities, content and fingerprint all go into the same batch, no awaits in between
+                    batch = pipe
+                    if entities["entity_id"]:
+                        stored = await store_code_entity_by_type(entities, key_prefix, redis_client, logger,
+                                                                 pipeline=batch)
+                    if await index_file_contents(file_path, app_dir, key_prefix, redis_client, logger,
+                                                 content=content, pipeline=batch, stat=stat):
+                        pipe_paths.append(_rel_path(file_path, app_dir))
+                except Exception as e:
+                    rel_path_str = _rel_path(file_path, app_dir)
+                    if logger:
+                        logger.error(f"Failed to process {rel_path_str}: {e} - this memory is corrupted!")
+
+                batched_files += 1
+                if batched_files >= PIPELINE_BATCH_FILES:
+                    await flush()
+                return stored
+
+        try:
+            results = await asyncio.gather(*(process(f) for f in files_to_index), return_exceptions=True)
+        finally:
+            if parse_pool:
+                parse_pool.shutdown()
+        if len(pipe):
+            await flush()
+        total_entities_processed = 0
+        for file_path, result in zip(files_to_index, results):
+            if isinstance(result, BaseException):
+                if logger:
+                    logger.error(f"Failed to process {file_path}: {result} - this memory is corrupted!")
+            else:
+                total_entities_processed += result
         
+        # Count what the brain actually holds - skipped files included, duplicates not
+        if not is_partial:
+            count_pipe = redis_client.pipeline(transaction=False)
+            for entity_type in ENTITY_TYPES:
+                count_pipe.hlen(f"{key_prefix}:{entity_type}s")
+            total_entities_processed = sum(await count_pipe.execute())
+
         # Save the metadata - brain scan complete!
         await store_project_metadata(
             app_dir, 
@@ -665,7 +1090,6 @@ async def async_index_project(app_dir: Path, specific_files: Optional[List[str]]
         if logger:
             logger.info(f"Memory upgrade complete! {len(python_files)} files and {total_entities_processed} code snippets stored")
         
-        await redis_client.aclose()
         return True
         
     except Exception as e:
@@ -682,39 +1106,33 @@ async def async_query(entity_type: str, name: Optional[str] = None, app_dir: Opt
         return []
     
     try:
-        redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-        await redis_client.ping()
+        redis_client = await _client()
         
         # Figure out which project we're thinking about
         if app_dir:
-            app_name = app_dir.resolve().name
+            app_name = _project_name(app_dir)
         else:
             # Find the most recently thought-about project
-            projects = []
             pattern = "code:*:metadata"
-            metadata_keys = await redis_client.keys(pattern)
+            metadata_keys = [key async for key in redis_client.scan_iter(match=pattern, count=SCAN_COUNT)]
+            metadata_values = await redis_client.mget(metadata_keys) if metadata_keys else []
             
-            for key in metadata_keys:
-                app_name = key.split(":")[1]
-                metadata_json = await redis_client.get(key)
-                if metadata_json:
-                    try:
-                        metadata = json.loads(metadata_json)
-                        projects.append({
-                            "name": app_name,
-                            "timestamp": metadata.get("last_indexed_timestamp", 0)
-                        })
-                    except:
-                        pass
+            def stamped_projects():
+                for key, metadata_json in zip(metadata_keys, metadata_values):
+                    if metadata_json:
+                        try:
+                            metadata = _loads(metadata_json)
+                            yield metadata.get("last_indexed_timestamp", 0), key.decode().split(":")[1]
+                        except:
+                            pass
             
-            if not projects:
+            # Only the freshest memory matters - one streaming pass, no sorting the whole attic
+            most_recent = max(stamped_projects(), key=itemgetter(0), default=None)
+            if most_recent is None:
                 if logger:
                     logger.error("No projects found in memory - have you indexed anything?")
                 return []
-                
-            # Sort by most recent - because who remembers old stuff anyway?
-            projects.sort(key=lambda p: p["timestamp"], reverse=True)
-            app_name = projects[0]["name"]
+            app_name = most_recent[1]
             
             if logger:
                 logger.info(f"Searching most recent project: {app_name}")
@@ -722,7 +1140,6 @@ async def async_query(entity_type: str, name: Optional[str] = None, app_dir: Opt
         key_prefix = f"code:{app_name}"
         results = await query_code_entity(key_prefix, entity_type, name, redis_client)
         
-        await redis_client.aclose()
         return results
         
     except Exception as e:
@@ -738,37 +1155,39 @@ async def async_get_info(app_dir: Optional[Path] = None, logger: Optional[loggin
         return {"projects": []}
     
     try:
-        redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-        await redis_client.ping()
+        redis_client = await _client()
         
         if app_dir:
             # Get info for a specific brain lobe
-            app_name = app_dir.resolve().name
+            app_name = _project_name(app_dir)
             key_prefix = f"code:{app_name}"
             project_info = await get_project_info(key_prefix, redis_client)
             result = {
                 "projects": [{"name": app_name, **project_info}]
             }
         else:
-            # Check the whole brain
-            projects = []
-            metadata_keys = await redis_client.keys("code:*:metadata")
+            # Check the whole brain - every project's scan in a single round trip
+            metadata_keys = {key async for key in redis_client.scan_iter(match="code:*:metadata", count=SCAN_COUNT)}
+            app_names = [key.decode().split(":")[1] for key in metadata_keys]
+            
+            pipeline = redis_client.pipeline(transaction=False)
+            for app_name in app_names:
+                queue_project_info(pipeline, f"code:{app_name}")
+            replies = await pipeline.execute()
             
-            for key in metadata_keys:
-                app_name = key.split(":")[1]
-                key_prefix = f"code:{app_name}"
-                project_info = await get_project_info(key_prefix, redis_client)
-                projects.append({"name": app_name, **project_info})
+            # Note each project's timestamp as we go, so sorting needs no digging
+            stamped_projects = []
+            for i, app_name in enumerate(app_names):
+                project_replies = replies[i * PROJECT_INFO_REPLIES : (i + 1) * PROJECT_INFO_REPLIES]
+                project_info = parse_project_info(project_replies)
+                timestamp = project_info["metadata"].get("last_indexed_timestamp", 0)
+                stamped_projects.append((timestamp, {"name": app_name, **project_info}))
             
             # Sort by most recently thought about
-            projects.sort(
-                key=lambda p: p.get("metadata", {}).get("last_indexed_timestamp", 0), 
-                reverse=True
-            )
+            stamped_projects.sort(key=itemgetter(0), reverse=True)
             
-            result = {"projects": projects}
+            result = {"projects": [project for _, project in stamped_projects]}
         
-        await redis_client.aclose()
         return result
         
     except Exception as e:
@@ -784,25 +1203,21 @@ async def async_clear_project(app_dir: Path, logger: Optional[logging.Logger] =
         return False
     
     try:
-        redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-        await redis_client.ping()
+        redis_client = await _client()
         
-        app_name = app_dir.resolve().name
+        app_name = _project_name(app_dir)
         key_prefix = f"code:{app_name}"
         
-        # Find all keys for this project
-        keys = await redis_client.keys(f"{key_prefix}:*")
+        # Find and erase all keys for this project, a SCAN page at a time
+        erased = await unlink_keys_matching(redis_client, f"{key_prefix}:*")
         
-        if keys:
+        if erased:
             if logger:
-                logger.info(f"Erasing {len(keys)} memories of {app_name} - was it that bad?")
-            await redis_client.delete(*keys)
-            await redis_client.aclose()
+                logger.info(f"Erased {erased} memories of {app_name} - was it that bad?")
             return True
         else:
             if logger:
                 logger.warning(f"No memories found for {app_name} - nothing to forget!")
-            await redis_client.aclose()
             return False
             
     except Exception as e:
@@ -814,194 +1229,287 @@ async def async_clear_project(app_dir: Path, logger: Optional[logging.Logger] =
 # Fancy Terminal Output Stuff #
 ###############################
 
-def print_entity_details(entity: Dict):
-    """Print pretty details about a code entity, with style!"""
-    entity_type = entity['entity_type'].upper()
+# Colorful headers based on entity type, dressed up once instead of per entity
+HEADER_FMT = {
+    "class": "🔷 CLASS: {}",
+    "function": "🔶 FUNCTION: {}",
+    "method": "🔸 METHOD: {}",
+    "variable": "💎 VARIABLE: {}",
+}
+ENTITY_DIVIDER = "➖" * 25
+
+def _render_entity(entity: Dict, emit) -> None:
+    """Hand each line describing a code entity to emit, with style!"""
+    get = entity.get  # Hot loop, so skip the attribute lookup every time
+    entity_type = entity['entity_type']
     name = entity['name']
+    header_fmt = HEADER_FMT.get(entity_type)
+    header = header_fmt.format(name) if header_fmt else f"{entity_type.upper()}: {name}"
     
-    # Colorful headers based on entity type
-    if entity_type == "CLASS":
-        header = f"🔷 CLASS: {name}"
-    elif entity_type == "FUNCTION":
-        header = f"🔶 FUNCTION: {name}"
-    elif entity_type == "METHOD":
-        header = f"🔸 METHOD: {name}"
-    elif entity_type == "VARIABLE":
-        header = f"💎 VARIABLE: {name}"
-    else:
-        header = f"{entity_type}: {name}"
-    
-    print(f"\n{header}")
-    print(f"📄 File: {entity['file_path']} (lines {entity['line_start']}-{entity['line_end']})")
+    emit("")
+    emit(header)
+    emit(f"📄 File: {entity['file_path']} (lines {entity['line_start']}-{entity['line_end']})")
     
-    if entity['entity_type'] == 'function' or entity['entity_type'] == 'method':
-        print(f"📝 Signature: {entity['signature']}")
-        if entity.get('parent_class'):
-            print(f"👪 Class: {entity['parent_class']}")
+    if entity_type == 'function' or entity_type == 'method':
+        emit(f"📝 Signature: {entity['signature']}")
+        parent_class = get('parent_class')
+        if parent_class:
+            emit(f"👪 Class: {parent_class}")
     
-    elif entity['entity_type'] == 'class':
-        if entity.get('bases'):
-            bases = ', '.join(entity['bases'])
-            print(f"👴 Inherits from: {bases}")
+    elif entity_type == 'class':
+        bases = get('bases')
+        if bases:
+            emit(f"👴 Inherits from: {', '.join(bases)}")
     
-    elif entity['entity_type'] == 'variable':
-        print(f"💰 Value: {entity.get('value_repr', '?')}")
-        if entity.get('parent_class'):
-            print(f"🏠 Class: {entity['parent_class']}")
+    elif entity_type == 'variable':
+        emit(f"💰 Value: {get('value_repr', '?')}")
+        parent_class = get('parent_class')
+        if parent_class:
+            emit(f"🏠 Class: {parent_class}")
     
-    if entity.get('docstring'):
-        docstring = entity['docstring'][:200]
-        if len(entity['docstring']) > 200:
+    full_docstring = get('docstring')
+    if full_docstring:
+        docstring = full_docstring[:200]
+        if len(full_docstring) > 200:
             docstring += '...'
-        print(f"📚 Docstring: {docstring}")
+        emit(f"📚 Docstring: {docstring}")
     
-    print("➖" * 25)
+    emit(ENTITY_DIVIDER)
 
-def print_project_info(info: Dict):
-    """Print a fancy report about your brain health."""
+def render_entities(entities: List[Dict]) -> str:
+    """Render a whole recall haul into one string: one shared line list, one join."""
+    lines = []
+    emit = lines.append
+    for entity in entities:
+        _render_entity(entity, emit)
+    emit("")
+    return "\n".join(lines)
+
+def format_project_info(info: Dict) -> str:
+    """Render a fancy report about your brain health."""
+    lines = []
     for project in info.get("projects", []):
-        print(f"\n🧠 Project: {project['name']}")
+        lines.append(f"\n🧠 Project: {project['name']}")
         
         metadata = project.get("metadata", {})
         if metadata:
-            print(f"🕒 Last indexed: {metadata.get('last_indexed_at', 'never')}")
+            lines.append(f"🕒 Last indexed: {metadata.get('last_indexed_at', 'never')}")
             
         counts = project.get("counts", {})
         if counts:
-            print(f"📁 Files: {counts.get('files', 0)}")
-            print(f"🔷 Classes: {counts.get('class', 0)}")
-            print(f"🔶 Functions: {counts.get('function', 0)}")
-            print(f"🔸 Methods: {counts.get('method', 0)}")
-            print(f"💎 Variables: {counts.get('variable', 0)}")
+            lines.append(f"📁 Files: {counts.get('files', 0)}")
+            lines.append(f"🔷 Classes: {counts.get('class', 0)}")
+            lines.append(f"🔶 Functions: {counts.get('function', 0)}")
+            lines.append(f"🔸 Methods: {counts.get('method', 0)}")
+            lines.append(f"💎 Variables: {counts.get('variable', 0)}")
         
-        print("➖" * 25)
+        lines.append("➖" * 25)
+    lines.append("")
+    return "\n".join(lines)
 
 ##############################
 # Command Line Shenanigans #
 ##############################
 
-async def main():
-    parser = argparse.ArgumentParser(
-        description="🧠 AI's External Brain Cells 🧠",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  brain_cells remember ~/myproject     # Index your entire codebase
-  brain_cells refresh app/models.py     # Update specific files
-  brain_cells recall class User         # Find all Users in your code
-  brain_cells status                   # Check what's in memory
-  brain_cells forget                   # Clear everything (Monday morning mode)
-        """
-    )
-    
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
-    
-    # Remember command (index)
+def _add_remember(subparsers):
     remember_parser = subparsers.add_parser("remember", help="Store code in memory")
     remember_parser.add_argument("path", type=str, nargs="?", default=".", 
                             help="Path to the app directory (default: current directory)")
-    
-    # Refresh command (update)
+
+def _add_refresh(subparsers):
     refresh_parser = subparsers.add_parser("refresh", help="Update specific files in memory")
     refresh_parser.add_argument("files", type=str, help="Comma-separated list of files to update")
     refresh_parser.add_argument("--project", type=str, help="Project directory (default: current directory)")
-    
-    # Recall command (query)
+
+def _add_recall(subparsers):
     recall_parser = subparsers.add_parser("recall", help="Search for code in memory")
     recall_parser.add_argument("entity_type", choices=["class", "function", "method", "variable"], 
                              help="Type of entity to search for")
     recall_parser.add_argument("name", type=str, nargs="?", help="Name to search for (optional)")
     recall_parser.add_argument("--project", type=str, help="Project to search in (default: most recent)")
-    
-    # Status command (info)
+
+def _add_status(subparsers):
     status_parser = subparsers.add_parser("status", help="Check what's in memory")
     status_parser.add_argument("--project", type=str, help="Project to check (default: all)")
-    
-    # Forget command (clear)
+
+def _add_forget(subparsers):
     forget_parser = subparsers.add_parser("forget", help="Clear indexed data")
     forget_parser.add_argument("--project", type=str, default=".",
                             help="Project to forget (default: current directory)")
+
+# Subcommand name -> parser builder; only the one you asked for gets built 🦥
+SUBCOMMANDS = {
+    "remember": _add_remember,
+    "refresh": _add_refresh,
+    "recall": _add_recall,
+    "status": _add_status,
+    "forget": _add_forget,
+}
+
+# Command -> (positional names, how many are required, defaults); a "project"
+# default means the command takes --project
+_FAST_ARGS = {
+    "remember": (("path",), 0, {"path": "."}),
+    "refresh": (("files",), 1, {"project": None}),
+    "recall": (("entity_type", "name"), 1, {"name": None, "project": None}),
+    "status": ((), 0, {"project": None}),
+    "forget": ((), 0, {"project": "."}),
+}
+
+def fast_parse_args(argv: List[str]) -> Optional[SimpleNamespace]:
+    """Parse the boring, well-formed command lines without waking argparse up.
+
+    Returns None for anything unusual (help, typos, odd flags) so argparse can
+    do the yelling."""
+    spec = _FAST_ARGS.get(argv[0]) if argv else None
+    if spec is None:
+        return None
+    names, required, defaults = spec
+    takes_project = "project" in defaults
+    values = dict(defaults, command=argv[0])
+    positionals = []
+    rest = iter(argv[1:])
+    for arg in rest:
+        if takes_project and arg == "--project":
+            value = next(rest, None)
+            if value is None or value.startswith("-"):
+                return None
+            values["project"] = value
+        elif takes_project and arg.startswith("--project="):
+            values["project"] = arg[len("--project="):]
+        elif arg.startswith("-"):
+            return None
+        else:
+            positionals.append(arg)
+    if not required <= len(positionals) <= len(names):
+        return None
+    values.update(zip(names, positionals))
+    if values.get("entity_type", ENTITY_TYPES[0]) not in ENTITY_TYPES:
+        return None
+    return SimpleNamespace(**values)
+
+def build_parser(argv: List[str]) -> "argparse.ArgumentParser":
+    """Build the CLI parser, skipping the subcommands nobody asked about."""
+    import argparse  # Only summoned for help and weird command lines
     
-    args = parser.parse_args()
+    parser = argparse.ArgumentParser(
+        description="🧠 AI's External Brain Cells 🧠",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  brain_cells remember ~/myproject     # Index your entire codebase
+  brain_cells refresh app/models.py     # Update specific files
+  brain_cells recall class User         # Find all Users in your code
+  brain_cells status                   # Check what's in memory
+  brain_cells forget                   # Clear everything (Monday morning mode)
+        """
+    )
+    
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+    
+    # Known command: build just that one. Help, typos, nothing at all: build the lot
+    command = argv[0] if argv else None
+    if command in SUBCOMMANDS:
+        SUBCOMMANDS[command](subparsers)
+    else:
+        for add_subcommand in SUBCOMMANDS.values():
+            add_subcommand(subparsers)
+    
+    return parser
+
+async def main():
+    argv = sys.argv[1:]
+    args = fast_parse_args(argv)
+    if args is None:
+        parser = build_parser(argv)
+        args = parser.parse_args(argv)
     
     # Setup brain activity logging
     log_dir = Path.home() / ".brain_cells" / "logs"
     logger = setup_logging(log_dir)
     
-    if args.command == "remember":
-        app_dir = Path(args.path).resolve()
-        logger.info(f"Memorizing project: {app_dir}")
+    try:
+        if args.command == "remember":
+            app_dir = Path(args.path).resolve()
+            project_name = app_dir.name
+            logger.info(f"Memorizing project: {app_dir}")
         
-        print(f"🧠 Creating memories of {app_dir.name}...")
-        success = await async_index_project(app_dir, None, logger)
+            print(f"🧠 Creating memories of {project_name}...")
+            success = await async_index_project(app_dir, None, logger)
         
-        if success:
-            print(f"✅ Successfully memorized {app_dir.name}! My brain feels bigger!")
-        else:
-            print(f"❌ Failed to memorize {app_dir.name} - I might have memory issues!")
-            sys.exit(1)
+            if success:
+                print(f"✅ Successfully memorized {project_name}! My brain feels bigger!")
+            else:
+                print(f"❌ Failed to memorize {project_name} - I might have memory issues!")
+                sys.exit(1)
     
-    elif args.command == "refresh":
-        project_dir = Path(args.project).resolve() if args.project else Path(".").resolve()
-        files = args.files.split(",")
-        logger.info(f"Refreshing memory of {len(files)} files in {project_dir}")
+        elif args.command == "refresh":
+            project_dir = Path(args.project or ".").resolve()
+            files = args.files.split(",")
+            file_count = len(files)
+            logger.info(f"Refreshing memory of {file_count} files in {project_dir}")
         
-        print(f"🔄 Updating memories of specific files in {project_dir.name}...")
-        success = await async_index_project(project_dir, files, logger)
+            print(f"🔄 Updating memories of specific files in {project_dir.name}...")
+            success = await async_index_project(project_dir, files, logger)
         
-        if success:
-            print(f"✅ Successfully updated memories of {len(files)} files! I feel refreshed!")
-        else:
-            print(f"❌ Failed to update memories - I'm still living in the past!")
-            sys.exit(1)
-    
-    elif args.command == "recall":
-        project_dir = Path(args.project).resolve() if args.project else None
-        entity_type = args.entity_type
-        name = args.name
-        
-        print(f"🔍 Searching memory for {entity_type}" + (f" named '{name}'" if name else "s") + "...")
-        results = await async_query(entity_type, name, project_dir, logger)
-        
-        if results:
-            print(f"🎉 Found {len(results)} {entity_type}(s)" + 
-                 (f" named '{name}'" if name else "") + "!")
-            for entity in results:
-                print_entity_details(entity)
-        else:
-            print(f"🤔 No {entity_type}(s) found" + 
-                 (f" with name '{name}'" if name else "") + " - are you sure it exists?")
-            sys.exit(1)
+            if success:
+                print(f"✅ Successfully updated memories of {file_count} files! I feel refreshed!")
+            else:
+                print(f"❌ Failed to update memories - I'm still living in the past!")
+                sys.exit(1)
     
-    elif args.command == "status":
-        project_dir = Path(args.project).resolve() if args.project else None
+        elif args.command == "recall":
+            project_dir = Path(args.project) if args.project else None
+            entity_type = args.entity_type
+            name = args.name
         
-        print("🔬 Scanning brain cells...")
-        info = await async_get_info(project_dir, logger)
+            named = f" named '{name}'" if name else ""
         
-        if info["projects"]:
-            print("📊 Brain scan results:")
-            print_project_info(info)
-        else:
-            print("😴 No projects in memory - my mind is a blank slate!")
-            sys.exit(1)
+            print(f"🔍 Searching memory for {entity_type}{named or 's'}...")
+            results = await async_query(entity_type, name, project_dir, logger)
+        
+            if results:
+                print(f"🎉 Found {len(results)} {entity_type}(s){named}!")
+                # One big write instead of a print() storm
+                sys.stdout.write(render_entities(results))
+            else:
+                print(f"🤔 No {entity_type}(s) found" + 
+                     (f" with name '{name}'" if name else "") + " - are you sure it exists?")
+                sys.exit(1)
     
-    elif args.command == "forget":
-        project_dir = Path(args.project).resolve()
-        logger.info(f"Forgetting project: {project_dir}")
+        elif args.command == "status":
+            project_dir = Path(args.project) if args.project else None
         
-        print(f"🗑️ Clearing memories of {project_dir.name}...")
-        success = await async_clear_project(project_dir, logger)
+            print("🔬 Scanning brain cells...")
+            info = await async_get_info(project_dir, logger)
         
-        if success:
-            print(f"✅ Successfully forgot {project_dir.name}. What were we talking about again?")
-        else:
-            print(f"❌ Failed to forget or nothing to forget about {project_dir.name}. Some memories are permanent!")
-            sys.exit(1)
+            if info["projects"]:
+                print("📊 Brain scan results:")
+                sys.stdout.write(format_project_info(info))
+            else:
+                print("😴 No projects in memory - my mind is a blank slate!")
+                sys.exit(1)
     
-    else:
-        parser.print_help()
-        print("\n🤔 Not sure what you want me to do with my brain cells...")
+        elif args.command == "forget":
+            project_dir = Path(args.project)
+            project_name = _project_name(project_dir)
+            logger.info(f"Forgetting project: {project_dir}")
+        
+            print(f"🗑️ Clearing memories of {project_name}...")
+            success = await async_clear_project(project_dir, logger)
+        
+            if success:
+                print(f"✅ Successfully forgot {project_name}. What were we talking about again?")
+            else:
+                print(f"❌ Failed to forget or nothing to forget about {project_name}. Some memories are permanent!")
+                sys.exit(1)
+    
+        else:
+            parser.print_help()
+            print("\n🤔 Not sure what you want me to do with my brain cells...")
+    finally:
+        # One pool for the whole run, closed on the way out
+        await close_redis_pool()
 
 if __name__ == "__main__":
     try: